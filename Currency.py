@@ -0,0 +1,122 @@
+################################################################
+# Project: Total Meal Cost Estimator
+# File: Currency.py
+# Description: Lets the calculator work in more than one currency.
+# Amounts are rounded to the number of minor units (cents) used by
+# each currency, and converted using an exchange rate snapshot that
+# is stored in a local file.  The snapshot is only read from disk
+# the first time it is needed.
+# Author: Gerry
+# Version: 1.0
+###############################################################
+
+import json
+import os
+
+# currency code: (symbol, number of digits after the decimal point)
+CURRENCIES = {
+    'USD': ('$', 2),
+    'CAD': ('$', 2),
+    'EUR': ('€', 2),
+    'GBP': ('£', 2),
+    'JPY': ('¥', 0),
+    'MXN': ('$', 2),
+}
+
+RATES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                          'exchange_rates.json')
+
+# the loaded snapshot, kept after the first load
+_rates = None
+
+
+def load_rates(file_name=RATES_FILE, reload=False):
+    ################################################################
+    # Function: load_rates
+    # Description: reads the exchange rate snapshot.  Each rate is
+    # the number of units of that currency that one unit of the
+    # snapshot's base currency buys.
+    # Parameters: file_name - the snapshot file to read
+    #             reload - read the file again even if it was
+    #             already loaded
+    # Returns: dictionary of currency code to rate
+    ###############################################################
+    global _rates
+    if _rates is None or reload:
+        with open(file_name, encoding='utf-8') as rates_file:
+            snapshot = json.load(rates_file)
+        _rates = snapshot['rates']
+    return _rates
+
+
+def round_minor(amount, currency_code):
+    ################################################################
+    # Function: round_minor
+    # Description: rounds an amount to the smallest unit of a currency
+    # Parameters: amount - the amount to round
+    #             currency_code - for example 'USD' or 'JPY'
+    # Returns: the rounded amount
+    ###############################################################
+    return round(amount, CURRENCIES[currency_code][1])
+
+
+def get_rate(from_code, to_code):
+    ################################################################
+    # Function: get_rate
+    # Description: finds the factor that converts an amount from one
+    # currency to another
+    # Parameters: from_code - the currency the amount is in
+    #             to_code - the currency wanted
+    # Returns: float
+    ###############################################################
+    rates = load_rates()
+    if from_code not in rates or to_code not in rates:
+        raise ValueError('no exchange rate for ' + from_code + ' to ' +
+                         to_code)
+    return rates[to_code] / rates[from_code]
+
+
+def convert(amount, from_code, to_code):
+    ################################################################
+    # Function: convert
+    # Description: converts an amount between currencies and rounds
+    # it to the minor unit of the new currency
+    # Parameters: amount - the amount to convert
+    #             from_code - the currency the amount is in
+    #             to_code - the currency wanted
+    # Returns: the converted amount
+    ###############################################################
+    if from_code == to_code:
+        return round_minor(amount, to_code)
+    return round_minor(amount * get_rate(from_code, to_code), to_code)
+
+
+def convert_many(amounts, from_code, to_code):
+    ################################################################
+    # Function: convert_many
+    # Description: converts a list of amounts between currencies.  The
+    # rate and rounding digits are looked up once for the whole list.
+    # Gives the same results as calling convert on each amount.
+    # Parameters: amounts - a list of amounts
+    #             from_code - the currency the amounts are in
+    #             to_code - the currency wanted
+    # Returns: a list of converted amounts
+    ###############################################################
+    digits = CURRENCIES[to_code][1]
+    if from_code == to_code:
+        return [round(amount, digits) for amount in amounts]
+    rate = get_rate(from_code, to_code)
+    return [round(amount * rate, digits) for amount in amounts]
+
+
+def format_amount(amount, currency_code):
+    ################################################################
+    # Function: format_amount
+    # Description: formats an amount for display, for example $12.50
+    # or ¥1870
+    # Parameters: amount - the amount to format
+    #             currency_code - the currency of the amount
+    # Returns: string
+    ###############################################################
+    symbol, digits = CURRENCIES[currency_code]
+    return symbol + format(round(amount, digits), '.' + str(digits) + 'f')
@@ -1,11 +1,11 @@
-# Module: ECGUI.py
+# Module: ECGUIMeal.py (a modified version of ECGUI.py)
 #
 # Python Version: 3.9
 #
 # Description: This module contains a collection of functions designed to make 
 #              creating a GUI in Python easier for the beginning programmer. 
 #              The programmer need only add this module to their project and 
-#              place 'import ECGUI' (without the single quotation marks) at the 
+#              place 'import ECGUIMeal' (without the single quotation marks) at the 
 #              top of their python file to use it.
 #
 #              It purposefully avoids using OOP to make it more understandable 
@@ -24,18 +24,28 @@
 #              selected arguments.
 #
 #              Examples:
-#                  lbl_ex1 = ECGUI.add_label(root_window)
-#                  lbl_ex2 = ECGUI.add_label(root_window, 'Hello World', 'red', 
+#                  lbl_ex1 = ECGUIMeal.add_label(root_window)
+#                  lbl_ex2 = ECGUIMeal.add_label(root_window, 'Hello World', 'red', 
 #                                           'yellow')
-#                  lbl_ex3 = ECGUI.add_label(root_window, message='Hello World', 
+#                  lbl_ex3 = ECGUIMeal.add_label(root_window, message='Hello World', 
 #                                            side='left', padding_left=5)
-#                  lbl_ex4 = ECGUI.add_label(root_window, 'Hello World', 'red', 
+#                  lbl_ex4 = ECGUIMeal.add_label(root_window, 'Hello World', 'red', 
 #                                           'yellow', side='left', fill='x')
 #
-# Version: 1.1.0
-# Last Modified: 11/1/2021
+# Version: 1.2.0
+# Last Modified: 10/19/2026
 # Author: Linda Zuvich (linda.zuvich@edmonds.edu)
 #         CS Department, Edmonds College, Lynnwood, WA
+#         Modified by Gerry (https://github.com/GerryS02)
+#         for the Total Meal Cost Estimator project
+#
+# Modifications:
+#     1.2.0 - renamed the module from ECGUI to ECGUIMeal
+#           - added add_window so one program can open several windows
+#           - added build_layout to build many controls from a description
+#           - split add_frame, add_label, add_button and add_entry_box into
+#             make_ functions that create a control and place_control,
+#             which places it
 #
 # License: This module may be used or distributed without modification by anyone
 #          for personal or educational use. It may not be sold individually or
@@ -69,6 +79,28 @@ def make_window(title='ECGUI Window', bg_color='white'):
     return window
 
 
+# Function: add_window
+# Description: Opens another window that belongs to a window made with
+#              make_window. Controls are added to it the same way. All of the
+#              windows share one mainloop, so only the first window's
+#              mainloop() should be called, and closing the first window
+#              closes the others.
+# Input: main_window - the window returned by make_window
+#        title (optional - default is 'ECGUI Window') - the text that
+#              appears in the top left corner of the window's title bar
+#        bg_color (optional - default is 'white') - the background color
+#                             of the window, which can be a basic text
+#                             color or a CSS-style hexadecimal value
+#                             beginning with a hashtag
+#                             (ex. 'white' or '#990000')
+# Output: a reference to the window object created
+def add_window(main_window, title='ECGUI Window', bg_color='white'):
+    window = tk.Toplevel(main_window)
+    window.title(title)
+    window['background'] = bg_color
+    return window
+
+
 # Function: add_frame
 # Description: Creates a frame (a container control) and places is in the
 #              given container.
@@ -96,14 +128,21 @@ def make_window(title='ECGUI Window', bg_color='white'):
 # Output: a reference to the frame created
 def add_frame(container, bg_color='white', padding_top=0, padding_right=0,
               padding_bottom=0, padding_left=0, side='', fill='none'):
+    frame = make_frame(container, bg_color)
+    place_control(frame, padding_top, padding_right, padding_bottom,
+                  padding_left, side, fill, 1)
+    return frame
+
+
+# Function: make_frame
+# Description: Creates a frame without placing it in its container. Used by
+#              add_frame and build_layout; call place_control to show it.
+# Input: container - the window or frame that will hold this frame
+#        bg_color (optional - default is 'white') - the background color of
+#                 the frame
+# Output: a reference to the frame created
+def make_frame(container, bg_color='white'):
     frame = tk.Frame(container)
-    if side == '' or (side != 'left' and side != 'right'):
-        frame.pack(padx=(padding_left, padding_right),
-                   pady=(padding_top, padding_bottom), expand=1, fill=fill)
-    else:
-        frame.pack(padx=(padding_left, padding_right),
-                   pady=(padding_top, padding_bottom), side=side, expand=1,
-                   fill=fill)
     frame['background'] = bg_color
     return frame
 
@@ -151,6 +190,20 @@ def add_label(container, message='', fg_color='black', bg_color='white',
               font_family='', font_size=12, bold=False, italics=False,
               padding_top=0, padding_right=0, padding_bottom=0,
               padding_left=0, side='', fill='none'):
+    label = make_label(container, message, fg_color, bg_color, font_family,
+                       font_size, bold, italics)
+    place_control(label, padding_top, padding_right, padding_bottom,
+                  padding_left, side, fill, 0 if fill == 'none' else 1)
+    return label
+
+
+# Function: make_label
+# Description: Creates a label control without placing it in its container.
+#              Used by add_label and build_layout; call place_control to show
+#              it. The inputs are the same as add_label's.
+# Output: a reference to the label control created
+def make_label(container, message='', fg_color='black', bg_color='white',
+               font_family='', font_size=12, bold=False, italics=False):
     if font_family != '':
         font_style = font_family + ' ' + str(font_size)
         if bold:
@@ -161,14 +214,6 @@ def add_label(container, message='', fg_color='black', bg_color='white',
                          font=font_style)
     else:
         label = tk.Label(container, text=message, fg=fg_color, bg=bg_color)
-    if side == 'left' or side == 'right':
-        label.pack(padx=(padding_left, padding_right),
-                   pady=(padding_top, padding_bottom), side=side,
-                   expand=0 if fill == 'none' else 1, fill=fill)
-    else:
-        label.pack(padx=(padding_left, padding_right),
-                   pady=(padding_top, padding_bottom),
-                   expand=0 if fill == 'none' else 1, fill=fill)
     return label
 
 
@@ -300,11 +345,11 @@ def change_image(canvas, image, width=300, height=200):
 #              brackets and separated by commas. Examples (assuming a reference
 #              to a button named btn_submit):
 #                  btn_submit['command'] = btn_submit_clicked
-#                  btn_submit['command'] = lambda: ECGUI.change_image(
+#                  btn_submit['command'] = lambda: ECGUIMeal.change_image(
 #                                          img_control, image2, 320, 240)
-#                  btn_submit['command'] = lambda: [ECGUI.change_image(
+#                  btn_submit['command'] = lambda: [ECGUIMeal.change_image(
 #                                          img_control, image2, 320, 240),
-#                                          ECGUI.change_label(lbl_heading,
+#                                          ECGUIMeal.change_label(lbl_heading,
 #                                          'Second Image')]
 # Input: container - the window or frame that will hold this button control
 #        message (optional - default is '') - what the button should say
@@ -323,16 +368,23 @@ def change_image(canvas, image, width=300, height=200):
 # Output: a reference to the button control created
 def add_button(container, message='', padding_top=0, padding_right=0,
                padding_bottom=0, padding_left=0, side=''):
-    button = tk.Button(container, text=message)
-    if side == 'left' or side == 'right':
-        button.pack(padx=(padding_left, padding_right),
-                    pady=(padding_top, padding_bottom), side=side)
-    else:
-        button.pack(padx=(padding_left, padding_right),
-                    pady=(padding_top, padding_bottom))
+    button = make_button(container, message)
+    place_control(button, padding_top, padding_right, padding_bottom,
+                  padding_left, side)
     return button
 
 
+# Function: make_button
+# Description: Creates a button control without placing it in its container.
+#              Used by add_button and build_layout; call place_control to
+#              show it.
+# Input: container - the window or frame that will hold this button control
+#        message (optional - default is '') - what the button should say
+# Output: a reference to the button control created
+def make_button(container, message=''):
+    return tk.Button(container, text=message)
+
+
 # Function: add_entry_box
 # Description: Adds an entry box control to a container, such as a window or
 #              a frame.
@@ -354,16 +406,50 @@ def add_button(container, message='', padding_top=0, padding_right=0,
 # Output: a reference to the entry box created
 def add_entry_box(container, width=10, padding_top=0, padding_right=0,
                   padding_bottom=0, padding_left=0, side=''):
-    entry_box = tk.Entry(container, width=width)
-    if side == 'left' or side == 'right':
-        entry_box.pack(padx=(padding_left, padding_right),
-                       pady=(padding_top, padding_bottom), side=side)
-    else:
-        entry_box.pack(padx=(padding_left, padding_right),
-                       pady=(padding_top, padding_bottom))
+    entry_box = make_entry_box(container, width)
+    place_control(entry_box, padding_top, padding_right, padding_bottom,
+                  padding_left, side)
     return entry_box
 
 
+# Function: make_entry_box
+# Description: Creates an entry box control without placing it in its
+#              container. Used by add_entry_box and build_layout; call
+#              place_control to show it.
+# Input: container - the window or frame that will hold this entry box
+#        width (optional - default is 10) - the number of characters across
+#              to make the entry box
+# Output: a reference to the entry box created
+def make_entry_box(container, width=10):
+    return tk.Entry(container, width=width)
+
+
+# Function: place_control
+# Description: Places a control made by one of the make_ functions in its
+#              container, in the next row or to the 'left' or 'right'.
+# Input: control - the control to place
+#        padding_top, padding_right, padding_bottom, padding_left (optional -
+#                default is 0) - the space around the control, in pixels
+#        side (optional - default is '') - '' for its own row, or 'left' or
+#             'right' to share the row with other controls
+#        fill (optional - default is '') - 'x', 'y', 'both' or 'none' to set
+#             how the control fills the space around it, or '' to leave
+#             fill and expand unset
+#        expand (optional - default is 0) - 1 to let the control take up
+#               extra space in the container; only used when fill is set
+# Output: nothing
+def place_control(control, padding_top=0, padding_right=0, padding_bottom=0,
+                  padding_left=0, side='', fill='', expand=0):
+    placement = {'padx': (padding_left, padding_right),
+                 'pady': (padding_top, padding_bottom)}
+    if side == 'left' or side == 'right':
+        placement['side'] = side
+    if fill != '':
+        placement['expand'] = expand
+        placement['fill'] = fill
+    control.pack(**placement)
+
+
 # Function: clear_entry_box
 # Description: Clears the text from an existing entry box control.
 # Input: entry_box - the entry box to clear
@@ -408,7 +494,7 @@ def fill_entry_box(entry_box, value):
 #         of radio buttons and, in either case, the zero-based index of the
 #         currently selected radio button as an IntVar. To get the integer value
 #         out of this, use the get() method. Example:
-#                btn_go, choice = ECGUI.add_radio_buttons(my_frame,
+#                btn_go, choice = ECGUIMeal.add_radio_buttons(my_frame,
 #                                 ['one', 'two', 'three'], button_message='GO')
 #                btn_go['command'] = lambda: change_image(img_top,
 #                                                         images[choice.get()])
@@ -492,7 +578,7 @@ def add_check_box(container, name, padding_top=0, padding_right=0,
 #         indicating which check boxes are currently checked. These values can
 #         be used as Booleans. To get the value out an IntVal, use the get()
 #         method. Example:
-#                selections = ECGUI.add_check_boxes(cb_frame,
+#                selections = ECGUIMeal.add_check_boxes(cb_frame,
 #                             ['bold', 'italics'], True)
 #                bold_setting = selections[0].get()
 def add_check_boxes(container, names, horizontal=False, spacing=5):
@@ -536,7 +622,7 @@ def add_check_boxes(container, names, horizontal=False, spacing=5):
 #         currently selected menu option. To get the string value from this,
 #         use the get method.
 #         Example:
-#                menu, color_option = ECGUI.add_dropdown(frame,
+#                menu, color_option = ECGUIMeal.add_dropdown(frame,
 #                                                  ['red', 'white', 'blue'],
 #                                                  'white')
 #                color_selected = color_option.get()
@@ -718,3 +804,86 @@ def show_message_box(title, message, message_type='info'):
         messagebox.showwarning(title, message)
     else:
         messagebox.showerror(title, message)
+
+
+# Function: build_layout
+# Description: Builds a whole set of controls from a description instead of
+#              one add_ function call at a time. The description is a list of
+#              dictionaries, one per control, in the order the controls should
+#              appear. Each dictionary has a 'type' ('frame', 'label',
+#              'button' or 'entry_box'), an optional 'name' used to get the
+#              control back, and any of the keyword arguments the matching
+#              add_ function accepts. A frame may have a 'children' list that
+#              describes the controls inside it. All of the controls are
+#              created first and then placed, in order, at the end. Example:
+#                  controls = ECGUIMeal.build_layout(root_window, [
+#                      {'type': 'frame', 'bg_color': 'beige', 'fill': 'x',
+#                       'children': [
+#                           {'type': 'label', 'message': 'Price:',
+#                            'bg_color': 'beige', 'side': 'left'},
+#                           {'type': 'entry_box', 'name': 'txt_price',
+#                            'side': 'right'}]},
+#                      {'type': 'button', 'name': 'btn_go', 'message': 'Go'}])
+#                  controls['btn_go']['command'] = go_clicked
+# Input: container - the window or frame that will hold the controls
+#        layout - the list of dictionaries describing the controls
+# Output: a dictionary of the named controls, with the name as the key
+def build_layout(container, layout):
+    controls = {}
+    to_place = []
+    add_layout_controls(container, layout, controls, to_place)
+    for control, placement in to_place:
+        place_control(control, *placement)
+    return controls
+
+
+# Function: add_layout_controls
+# Description: Creates the controls described in a layout without placing
+#              them. Used by build_layout.
+# Input: container - the window or frame that will hold the controls
+#        layout - the list of dictionaries describing the controls
+#        controls - the dictionary the named controls are added to
+#        to_place - the list each new control and its place_control
+#                   arguments are added to
+# Output: nothing
+def add_layout_controls(container, layout, controls, to_place):
+    for item in layout:
+        options = dict(item)
+        control_type = options.pop('type')
+        name = options.pop('name', '')
+        children = options.pop('children', [])
+        placement = [options.pop('padding_top', 0),
+                     options.pop('padding_right', 0),
+                     options.pop('padding_bottom', 0),
+                     options.pop('padding_left', 0),
+                     options.pop('side', '')]
+
+        if control_type == 'frame':
+            fill = options.pop('fill', 'none')
+            control = make_frame(container, options.pop('bg_color', 'white'))
+            placement += [fill, 1]
+        elif control_type == 'label':
+            fill = options.pop('fill', 'none')
+            control = make_label(container, options.pop('message', ''),
+                                 options.pop('fg_color', 'black'),
+                                 options.pop('bg_color', 'white'),
+                                 options.pop('font_family', ''),
+                                 options.pop('font_size', 12),
+                                 options.pop('bold', False),
+                                 options.pop('italics', False))
+            placement += [fill, 0 if fill == 'none' else 1]
+        elif control_type == 'button':
+            control = make_button(container, options.pop('message', ''))
+        elif control_type == 'entry_box':
+            control = make_entry_box(container, options.pop('width', 10))
+        else:
+            raise ValueError('unknown control type: ' + str(control_type))
+        if len(options) > 0:
+            raise ValueError('unknown ' + control_type + ' settings: ' +
+                             ', '.join(options))
+
+        if name != '':
+            controls[name] = control
+        to_place.append((control, placement))
+        if len(children) > 0:
+            add_layout_controls(control, children, controls, to_place)
@@ -0,0 +1,302 @@
+################################################################
+# Project: Total Meal Cost Estimator
+# File: Fuzz.py
+# Description: Differential test harness for fast code paths.  It
+# feeds the same random and hand-picked price strings to a reference
+# function and to a faster version of it, and reports any input where
+# the two disagree.  Failing inputs are shrunk to the smallest string
+# that still shows the problem.
+#
+# Run it from the command line:
+#     python Fuzz.py --count 1000000 --seed 7
+# Author: Gerry
+# Version: 1.0
+###############################################################
+
+import argparse
+import atexit
+import contextlib
+import datetime
+import io
+import os
+import random
+import zlib
+
+import Currency
+import Pricing
+import Promotions
+import SharedState
+import Util
+
+# characters the random strings are built from, weighted toward the
+# ones a price is made of
+ALPHABET = ('0123456789' * 4 + '....' + '-+ ,$e_\t\n' +
+            '\x00٣０½⁰²')
+
+# inputs that have broken number parsers before
+ADVERSARIAL = [
+    '', '.', '..', '0', '00', '0.', '.0', '1.2.3', '-1', '+1', ' 1', '1 ',
+    '1\n', '1e5', '1E5', 'inf', 'nan', '1_000', '1,000', '$5', '٣',
+    '１２', '½', '²', '12\x00', '9' * 400,
+    '0.' + '9' * 400, '.' * 50,
+]
+
+# the biggest number of mismatches kept in a report
+MAX_REPORTED = 20
+# the most failing inputs shrunk per check, in case they all shrink
+# to the same few strings and the report never fills
+MAX_MINIMIZED = 1000
+
+
+def random_price_string(rng, max_length=12):
+    ################################################################
+    # Function: random_price_string
+    # Description: makes a random string that often looks like a
+    # price and sometimes does not
+    # Parameters: rng - a random.Random object
+    #             max_length - the longest string to make
+    # Returns: string
+    ###############################################################
+    roll = rng.random()
+    if roll < 0.4:
+        # a well formed price
+        return str(rng.randint(0, 10 ** rng.randint(1, 6))) + \
+               rng.choice(['', '.', '.' + str(rng.randint(0, 99))])
+    if roll < 0.5:
+        # a well formed price with one character changed
+        chars = list('%.2f' % (rng.random() * 1000))
+        chars[rng.randrange(len(chars))] = rng.choice(ALPHABET)
+        return ''.join(chars)
+    length = rng.randint(0, max_length)
+    return ''.join(rng.choice(ALPHABET) for _ in range(length))
+
+
+def generate_inputs(count, seed=0):
+    ################################################################
+    # Function: generate_inputs
+    # Description: yields the adversarial inputs followed by random
+    # ones
+    # Parameters: count - how many random inputs to make
+    #             seed - the random seed, so a run can be repeated
+    # Returns: a generator of strings
+    ###############################################################
+    rng = random.Random(seed)
+    for value in ADVERSARIAL:
+        yield value
+    for _ in range(count):
+        yield random_price_string(rng)
+
+
+def call_safely(function, value):
+    ################################################################
+    # Function: call_safely
+    # Description: calls a function and turns an exception into a
+    # value, so that raising the same error counts as agreeing
+    # Parameters: function - the function to call
+    #             value - the argument to pass
+    # Returns: the function's result or ('error', exception name)
+    ###############################################################
+    try:
+        return function(value)
+    except Exception as error:
+        return ('error', type(error).__name__)
+
+
+def results_match(first, second):
+    ################################################################
+    # Function: results_match
+    # Description: checks two results for equality, treating two NaN
+    # values as equal since NaN never equals itself, also inside
+    # tuples
+    # Parameters: first, second - the results to compare
+    # Returns: boolean
+    ###############################################################
+    if isinstance(first, tuple) and isinstance(second, tuple):
+        return len(first) == len(second) and \
+            all(map(results_match, first, second))
+    return first == second or (first != first and second != second)
+
+
+def minimize(value, still_fails):
+    ################################################################
+    # Function: minimize
+    # Description: shrinks a failing input by removing characters
+    # while the failure still happens
+    # Parameters: value - the failing string
+    #             still_fails - function that returns True if a
+    #             string still fails
+    # Returns: the shortest failing string found
+    ###############################################################
+    changed = True
+    while changed:
+        changed = False
+        index = 0
+        while index < len(value):
+            smaller = value[:index] + value[index + 1:]
+            if still_fails(smaller):
+                value = smaller
+                changed = True
+            else:
+                index += 1
+    return value
+
+
+def compare(reference, candidate, inputs):
+    ################################################################
+    # Function: compare
+    # Description: runs two functions on every input and collects
+    # the inputs where they give different results
+    # Parameters: reference - the trusted function
+    #             candidate - the fast function being checked
+    #             inputs - an iterable of strings
+    # Returns: (number of inputs checked, number of inputs that
+    #          disagreed, list of mismatches), where each mismatch is
+    #          (minimized input, original input, reference result,
+    #          candidate result).  Only the first MAX_REPORTED different
+    #          minimized inputs are kept.
+    ###############################################################
+    def disagrees(value):
+        return not results_match(call_safely(reference, value),
+                                 call_safely(candidate, value))
+
+    checked = 0
+    disagreed = 0
+    minimized = 0
+    mismatches = []
+    seen = set()
+    for value in inputs:
+        checked += 1
+        if disagrees(value):
+            disagreed += 1
+            # shrinking is slow, so stop once the report is full
+            if len(mismatches) < MAX_REPORTED and \
+                    minimized < MAX_MINIMIZED:
+                minimized += 1
+                small = minimize(value, disagrees)
+                if small not in seen:
+                    seen.add(small)
+                    mismatches.append((small, value,
+                                       call_safely(reference, small),
+                                       call_safely(candidate, small)))
+    return checked, disagreed, mismatches
+
+
+def convert_one(str_price):
+    # reference: convert a single amount
+    return Currency.convert(float(str_price), 'USD', 'EUR')
+
+
+def convert_batch(str_price):
+    # candidate: the same amount through the batch path
+    return Currency.convert_many([float(str_price)], 'USD', 'EUR')[0]
+
+
+def calculate_one(str_price):
+    # reference: the scalar functions behind the submit button
+    tax = Pricing.CalcTax(str_price)
+    tip = Pricing.CalcTip(str_price)
+    return (tax, tip, Pricing.CalcTotPrice(str_price, tax, tip))
+
+
+# the shared block used by calculate_shared, made on first use
+_shared_block = None
+
+
+def calculate_shared(str_price):
+    # candidate: the precomputed table in shared memory
+    global _shared_block
+    if _shared_block is None:
+        _shared_block = SharedState.create('meal_fuzz_' + str(os.getpid()))
+        atexit.register(_shared_block.unlink)
+    return SharedState.calculate_price(_shared_block, str_price)
+
+
+# whole-check promotions whose time windows start and end part way
+# through an hour, including ones that wrap past midnight back into
+# the hour they started in
+PROMOTION_WINDOWS = [
+    {'name': 'wraps into its own hour', 'kind': 'percent', 'value': 10,
+     'start': '10:30', 'end': '10:15'},
+    {'name': 'late night', 'kind': 'fixed', 'value': 3,
+     'start': '22:45', 'end': '02:10'},
+    {'name': 'lunch', 'kind': 'percent', 'value': 15,
+     'start': '11:50', 'end': '13:05'},
+]
+# the promotions filed under each hour, as the register looks them up
+_hourly_promotions = Promotions.compile_promotions(PROMOTION_WINDOWS)
+# the same rules filed under every hour, so only is_active decides
+_every_rule = list(dict.fromkeys(
+    rule for hour in _hourly_promotions
+    for rule in hour.get(('check', ''), [])))
+_flat_promotions = [{('check', ''): _every_rule} for _ in range(24)]
+
+
+def promotion_time(str_price):
+    # a time of day picked from the input, so every input is checked
+    # at a different minute but a run can still be repeated
+    minute = zlib.crc32(str_price.encode('utf-8', 'replace')) % \
+        Promotions.MINUTES_PER_DAY
+    return datetime.datetime(2026, 1, 1, minute // 60, minute % 60)
+
+
+def discount_every_rule(str_price):
+    # reference: check every rule's time window
+    return Promotions.apply_to_price(_flat_promotions, str_price,
+                                     promotion_time(str_price))
+
+
+def discount_hourly(str_price):
+    # candidate: only the rules filed under the current hour
+    return Promotions.apply_to_price(_hourly_promotions, str_price,
+                                     promotion_time(str_price))
+
+
+# name: (reference, candidate) for every fast path being checked
+CHECKS = {
+    'is_numeric': (Util.is_numeric, Util.is_numeric_fast),
+    'convert': (convert_one, convert_batch),
+    'shared_table': (calculate_one, calculate_shared),
+    'promotion_hours': (discount_every_rule, discount_hourly),
+}
+
+
+def run(count, seed=0, names=None):
+    ################################################################
+    # Function: run
+    # Description: runs every check and prints a report
+    # Parameters: count - how many random inputs each check gets
+    #             seed - the random seed
+    #             names - the checks to run, or None for all of them
+    # Returns: True if no mismatches were found
+    ###############################################################
+    all_passed = True
+    for name in names or CHECKS:
+        reference, candidate = CHECKS[name]
+        # is_numeric prints a message for every empty string
+        with contextlib.redirect_stdout(io.StringIO()):
+            checked, disagreed, mismatches = compare(
+                reference, candidate, generate_inputs(count, seed))
+        print(name + ': ' + str(checked) + ' inputs, ' + str(disagreed) +
+              ' mismatches')
+        if disagreed > 0:
+            print('    smallest failing inputs found (' +
+                  str(len(mismatches)) + ' shown):')
+        for small, original, expected, actual in mismatches:
+            print('    ' + repr(small) + ' (from ' + repr(original) +
+                  '): reference ' + repr(expected) + ', fast ' +
+                  repr(actual))
+        if disagreed > 0:
+            all_passed = False
+    return all_passed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Compare fast code paths against the reference ones.')
+    parser.add_argument('--count', type=int, default=100000,
+                        help='random inputs per check')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--check', action='append', choices=sorted(CHECKS),
+                        help='run only this check (may be repeated)')
+    args = parser.parse_args()
+    raise SystemExit(0 if run(args.count, args.seed, args.check) else 1)
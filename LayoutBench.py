@@ -0,0 +1,104 @@
+################################################################
+# Project: Total Meal Cost Estimator
+# File: LayoutBench.py
+# Description: Measures how long it takes for a window with many
+# controls to appear, building it once with one ECGUIMeal add_ call
+# per control and once with ECGUIMeal.build_layout.  Each build is
+# timed up to the point where the window has worked out its layout.
+#
+# Run it from the command line (needs a display):
+#     python LayoutBench.py --rows 200 --repeat 5
+# Author: Gerry
+# Version: 1.0
+###############################################################
+
+import argparse
+import time
+
+import ECGUIMeal
+
+
+def build_by_calls(window, rows):
+    ################################################################
+    # Function: build_by_calls
+    # Description: adds the test controls one add_ call at a time
+    # Parameters: window - the window to fill
+    #             rows - how many rows of controls to add
+    # Returns: nothing
+    ###############################################################
+    for row in range(rows):
+        frame = ECGUIMeal.add_frame(window, bg_color='beige', fill='x')
+        ECGUIMeal.add_label(frame, 'Item ' + str(row), bg_color='beige',
+                            side='left', padding_left=5)
+        ECGUIMeal.add_entry_box(frame, width=10, side='right',
+                                padding_right=5)
+        ECGUIMeal.add_button(frame, 'Add', side='right')
+
+
+def make_layout(rows):
+    ################################################################
+    # Function: make_layout
+    # Description: describes the same controls as build_by_calls
+    # Parameters: rows - how many rows of controls to describe
+    # Returns: a layout list for ECGUIMeal.build_layout
+    ###############################################################
+    layout = []
+    for row in range(rows):
+        layout.append({'type': 'frame', 'bg_color': 'beige', 'fill': 'x',
+                       'children': [
+                           {'type': 'label', 'message': 'Item ' + str(row),
+                            'bg_color': 'beige', 'side': 'left',
+                            'padding_left': 5},
+                           {'type': 'entry_box', 'width': 10,
+                            'side': 'right', 'padding_right': 5},
+                           {'type': 'button', 'message': 'Add',
+                            'side': 'right'}]})
+    return layout
+
+
+def time_build(build, rows):
+    ################################################################
+    # Function: time_build
+    # Description: times one build in a fresh window
+    # Parameters: build - a function that takes (window, rows)
+    #             rows - how many rows of controls to build
+    # Returns: seconds taken
+    ###############################################################
+    window = ECGUIMeal.make_window('Layout Benchmark')
+    start = time.perf_counter()
+    build(window, rows)
+    window.update_idletasks()
+    elapsed = time.perf_counter() - start
+    window.destroy()
+    return elapsed
+
+
+def run(rows, repeat):
+    ################################################################
+    # Function: run
+    # Description: times both ways of building the window and prints
+    # the best time of each
+    # Parameters: rows - how many rows of controls to build
+    #             repeat - how many times to time each way
+    # Returns: (best call-by-call time, best build_layout time)
+    ###############################################################
+    layout = make_layout(rows)
+    by_calls = min(time_build(build_by_calls, rows)
+                   for _ in range(repeat))
+    by_layout = min(time_build(lambda window, count:
+                               ECGUIMeal.build_layout(window, layout), rows)
+                    for _ in range(repeat))
+    controls = rows * 4
+    print(str(controls) + ' controls, best of ' + str(repeat))
+    print('    one call per control: %.1f ms' % (by_calls * 1000))
+    print('    build_layout:         %.1f ms' % (by_layout * 1000))
+    return by_calls, by_layout
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Compare ways of building a large ECGUI window.')
+    parser.add_argument('--rows', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    run(args.rows, args.repeat)
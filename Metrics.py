@@ -0,0 +1,217 @@
+################################################################
+# Project: Total Meal Cost Estimator
+# File: Metrics.py
+# Description: Keeps simple operational metrics (counters and
+# latency histograms) and exports them in the Prometheus text
+# format, either by rewriting a local file every few seconds or by
+# serving them over HTTP.
+#
+# Counters and histograms are only changed from the GUI thread and
+# only read by the exporter, so no locks are taken: a reader may see
+# a histogram that is one observation behind, never a broken one.
+# Author: Gerry
+# Version: 1.0
+###############################################################
+
+import bisect
+import http.server
+import os
+import sys
+import threading
+import time
+
+# upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                   0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+# name: [help text, value]
+_counters = {}
+# name: [help text, bucket bounds, bucket counts, sum, count]
+_histograms = {}
+# name: [help text, function that returns the current value]
+_gauges = {}
+
+
+def add_counter(name, help_text=''):
+    ################################################################
+    # Function: add_counter
+    # Description: registers a counter that starts at zero
+    # Parameters: name - the metric name
+    #             help_text - a description shown in the export
+    # Returns: nothing
+    ###############################################################
+    if name not in _counters:
+        _counters[name] = [help_text, 0]
+
+
+def add_histogram(name, help_text='', buckets=LATENCY_BUCKETS):
+    ################################################################
+    # Function: add_histogram
+    # Description: registers a histogram with the given buckets
+    # Parameters: name - the metric name
+    #             help_text - a description shown in the export
+    #             buckets - the upper bound of each bucket, smallest
+    #             first
+    # Returns: nothing
+    ###############################################################
+    if name not in _histograms:
+        _histograms[name] = [help_text, tuple(buckets),
+                             [0] * (len(buckets) + 1), 0.0, 0]
+
+
+def add_gauge(name, function, help_text=''):
+    ################################################################
+    # Function: add_gauge
+    # Description: registers a gauge whose value is worked out by a
+    # function each time the metrics are exported
+    # Parameters: name - the metric name
+    #             function - a function with no parameters that
+    #             returns a number
+    #             help_text - a description shown in the export
+    # Returns: nothing
+    ###############################################################
+    _gauges[name] = [help_text, function]
+
+
+def increment(name, amount=1):
+    ################################################################
+    # Function: increment
+    # Description: adds to a counter
+    # Parameters: name - a registered counter
+    #             amount - how much to add
+    # Returns: nothing
+    ###############################################################
+    _counters[name][1] += amount
+
+
+def observe(name, value):
+    ################################################################
+    # Function: observe
+    # Description: records one value, such as a latency, in a
+    # histogram
+    # Parameters: name - a registered histogram
+    #             value - the value to record
+    # Returns: nothing
+    ###############################################################
+    histogram = _histograms[name]
+    histogram[2][bisect.bisect_left(histogram[1], value)] += 1
+    histogram[3] += value
+    histogram[4] += 1
+
+
+def get_counter(name):
+    ################################################################
+    # Function: get_counter
+    # Description: reports the current value of a counter
+    # Parameters: name - a registered counter
+    # Returns: number
+    ###############################################################
+    return _counters[name][1]
+
+
+def render():
+    ################################################################
+    # Function: render
+    # Description: formats every metric in the Prometheus text format
+    # Parameters: none
+    # Returns: string
+    ###############################################################
+    lines = []
+    for name, (help_text, value) in _counters.items():
+        lines.append('# HELP ' + name + ' ' + help_text)
+        lines.append('# TYPE ' + name + ' counter')
+        lines.append(name + ' ' + str(value))
+    for name, (help_text, function) in _gauges.items():
+        lines.append('# HELP ' + name + ' ' + help_text)
+        lines.append('# TYPE ' + name + ' gauge')
+        lines.append(name + ' ' + repr(float(function())))
+    for name, (help_text, buckets, counts, total, count) in \
+            _histograms.items():
+        # copy the counts once and total them, so the buckets and the
+        # count always agree even if an observation arrives meanwhile
+        counts = list(counts)
+        count = sum(counts)
+        lines.append('# HELP ' + name + ' ' + help_text)
+        lines.append('# TYPE ' + name + ' histogram')
+        running = 0
+        for index in range(len(buckets)):
+            running += counts[index]
+            lines.append(name + '_bucket{le="' + repr(buckets[index]) +
+                         '"} ' + str(running))
+        lines.append(name + '_bucket{le="+Inf"} ' + str(count))
+        lines.append(name + '_sum ' + repr(total))
+        lines.append(name + '_count ' + str(count))
+    return '\n'.join(lines) + '\n'
+
+
+def write_file(file_name):
+    ################################################################
+    # Function: write_file
+    # Description: writes the metrics to a file.  The file is written
+    # under a temporary name and then renamed, so a reader never sees
+    # half of it.
+    # Parameters: file_name - the file to write
+    # Returns: nothing
+    ###############################################################
+    temp_name = file_name + '.tmp'
+    with open(temp_name, 'w', encoding='utf-8') as metrics_file:
+        metrics_file.write(render())
+    os.replace(temp_name, file_name)
+
+
+def start_file_export(file_name, interval=15):
+    ################################################################
+    # Function: start_file_export
+    # Description: rewrites the metrics file every few seconds on a
+    # background thread that stops when the program ends.  A failed
+    # write is reported and tried again next time.
+    # Parameters: file_name - the file to write
+    #             interval - seconds between writes
+    # Returns: the thread doing the writing
+    ###############################################################
+    def export_loop():
+        while True:
+            time.sleep(interval)
+            try:
+                write_file(file_name)
+            except Exception as error:
+                print('could not write metrics to ' + file_name + ': ' +
+                      str(error), file=sys.stderr)
+
+    thread = threading.Thread(target=export_loop, daemon=True)
+    thread.start()
+    return thread
+
+
+class _MetricsHandler(http.server.BaseHTTPRequestHandler):
+    # answers GET /metrics with the current metrics
+    def do_GET(self):
+        if self.path != '/metrics':
+            self.send_error(404)
+            return
+        body = render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # keep scrapes out of the console
+        pass
+
+
+def start_http_server(port, address=''):
+    ################################################################
+    # Function: start_http_server
+    # Description: serves the metrics at http://address:port/metrics
+    # on a background thread that stops when the program ends
+    # Parameters: port - the port to listen on
+    #             address - the address to listen on, '' for all
+    # Returns: the server, which can be stopped with shutdown()
+    ###############################################################
+    server = http.server.ThreadingHTTPServer((address, port),
+                                             _MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
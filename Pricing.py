@@ -0,0 +1,91 @@
+################################################################
+# Project: Total Meal Cost Estimator
+# File: Pricing.py
+# Description: Works out the discount, tax, tip and total price for
+# a price typed at the register.  The GUI, receipts and the shared
+# memory workers all go through price_meal, so a promotion is taken
+# off the same way everywhere.  Does not import the GUI.
+# Author: Gerry
+# Version: 1.0
+###############################################################
+
+import Currency
+import Promotions
+import Settings
+import Util
+
+# the most price results kept in the shared cache
+CACHE_SIZE = 10000
+
+# the promotions in Settings.ACTIVE_PROMOTIONS, ready to look up
+PROMOTIONS = Promotions.compile_promotions(Settings.ACTIVE_PROMOTIONS)
+
+# price string: (tax, tip, total price), shared by all registers
+results_cache = {}
+
+
+def price_meal(str_price, calculate_price=None, when=None):
+    ################################################################
+    # Function: price_meal
+    # Description: takes the active promotions off a price and then
+    # works out tax, tip and total on what is left
+    # Parameters: str_price - the price as typed
+    #             calculate_price - the function that works out
+    #             (tax, tip, total) for a price string, by default
+    #             calculate
+    #             when - a datetime for the promotions, by default now
+    # Returns: (discount, tax, tip, total price), or None if the price
+    #          is not numeric.  A price discounted down to 0 is valid.
+    ###############################################################
+    charged, discount = Promotions.apply_to_price(
+        PROMOTIONS, str_price, when, Settings.CURRENCY_CODE)
+    tax, tip, total_price = (calculate_price or calculate)(charged)
+    if total_price > 0 or discount > 0:
+        return (discount, tax, tip, total_price)
+    return None
+
+# calculate tax, tip and total price, reusing earlier results
+def calculate(str_price):
+    result = results_cache.get(str_price)
+    if result is None:
+        tax = CalcTax(str_price)
+        tip = CalcTip(str_price)
+        result = (tax, tip, CalcTotPrice(str_price, tax, tip))
+        if len(results_cache) >= CACHE_SIZE:
+            results_cache.clear()
+        results_cache[str_price] = result
+    return result
+
+# function to calculate total price including tax and tip
+def CalcTotPrice(string_price, st_tax, st_tip):
+
+    # check if input is numeric
+    if Util.is_numeric(string_price):
+        price = float(string_price)
+        tax = float(st_tax)
+        tip = float(st_tip)
+
+        total_p = price + tax + tip
+        total_p = Currency.round_minor(total_p, Settings.CURRENCY_CODE)
+    else:
+        total_p = 0
+    return total_p
+
+def CalcTax(string_price):
+    if Util.is_numeric(string_price):
+        amount = float(string_price)
+        tax = amount * Settings.TAX_FACTOR
+        tax = Currency.round_minor(tax, Settings.CURRENCY_CODE)
+    else:
+        tax = 0
+    return tax
+
+def CalcTip(string_price):
+    if Util.is_numeric(string_price):
+        amount = float(string_price)
+
+        tip = amount * Settings.TIP_FACTOR
+        tip = Currency.round_minor(tip, Settings.CURRENCY_CODE)
+    else:
+        tip = 0
+    return tip
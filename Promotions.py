@@ -0,0 +1,215 @@
+################################################################
+# Project: Total Meal Cost Estimator
+# File: Promotions.py
+# Description: Applies discounts, coupons and promotions to a check
+# before tax is worked out.  A promotion is a dictionary such as:
+#
+#     {'name': 'Happy hour wings', 'kind': 'percent', 'value': 50,
+#      'item': 'wings', 'start': '16:00', 'end': '18:00'}
+#
+# kind is 'percent' (value percent off), 'fixed' (value off each
+# unit, or off the whole check) or 'bogo' (buy one, get one free).
+# A promotion applies to one 'item', to every item in a 'category',
+# or, with neither, to the whole check.  'start' and 'end' limit it
+# to a time of day; a window such as 22:00 to 02:00 runs past
+# midnight.
+#
+# compile_promotions sorts the promotions into one lookup table per
+# hour of the day, keyed by item, category or the whole check, so a
+# check only looks at the promotions that can apply to it.  Each
+# line, and then the check, gets the single best discount on offer;
+# discounts do not stack.
+# Author: Gerry
+# Version: 1.0
+###############################################################
+
+import datetime
+
+import Currency
+import Util
+
+KINDS = ('percent', 'fixed', 'bogo')
+# every key a promotion may have; anything else is most likely a typo
+# that would otherwise turn the promotion into a whole-check discount
+KEYS = ('name', 'kind', 'value', 'item', 'category', 'start', 'end')
+MINUTES_PER_DAY = 24 * 60
+
+
+def time_to_minutes(str_time):
+    ################################################################
+    # Function: time_to_minutes
+    # Description: turns a time of day such as '16:30' into minutes
+    # after midnight
+    # Parameters: str_time - the time as 'HH:MM'
+    # Returns: integer
+    ###############################################################
+    hours, _, minutes = str_time.partition(':')
+    return int(hours) * 60 + int(minutes or '0')
+
+
+def compile_promotions(promotions):
+    ################################################################
+    # Function: compile_promotions
+    # Description: checks a list of promotions and sorts them into
+    # one lookup table for each hour of the day
+    # Parameters: promotions - a list of promotion dictionaries
+    # Returns: a list of 24 dictionaries, each mapping ('item', name),
+    #          ('category', name) or ('check', '') to a list of
+    #          (kind, value, start minute, end minute) tuples
+    ###############################################################
+    hours = [{} for _ in range(24)]
+    for promotion in promotions:
+        for name in promotion:
+            if name not in KEYS:
+                raise ValueError('unknown promotion key: ' + str(name))
+        kind = promotion['kind']
+        if kind not in KINDS:
+            raise ValueError('unknown promotion kind: ' + str(kind))
+        if kind != 'bogo' and 'value' not in promotion:
+            raise ValueError('a ' + kind + ' promotion needs a value')
+        if 'item' in promotion:
+            key = ('item', promotion['item'])
+        elif 'category' in promotion:
+            key = ('category', promotion['category'])
+        elif kind == 'bogo':
+            raise ValueError('a bogo promotion needs an item or category')
+        else:
+            key = ('check', '')
+        start = time_to_minutes(promotion.get('start', '00:00'))
+        end = time_to_minutes(promotion.get('end', '24:00'))
+        rule = (kind, float(promotion.get('value', 0)), start, end)
+
+        # file the rule under every hour its window touches, counting
+        # from the start of the hour it begins in; a window that wraps
+        # round to the hour it began in touches that hour twice
+        minute = start - start % 60
+        length = start % 60 + ((end - start) % MINUTES_PER_DAY or
+                               MINUTES_PER_DAY)
+        filed = set()
+        for offset in range(0, length, 60):
+            hour = ((minute + offset) // 60) % 24
+            if hour not in filed:
+                filed.add(hour)
+                hours[hour].setdefault(key, []).append(rule)
+    return hours
+
+
+def is_active(rule, minute):
+    ################################################################
+    # Function: is_active
+    # Description: checks a rule's time window
+    # Parameters: rule - a compiled rule tuple
+    #             minute - minutes after midnight
+    # Returns: boolean
+    ###############################################################
+    start = rule[2]
+    end = rule[3]
+    if start < end:
+        return start <= minute < end
+    # the window runs past midnight
+    return minute >= start or minute < end
+
+
+def line_discount(rule, price, quantity):
+    ################################################################
+    # Function: line_discount
+    # Description: works out how much a rule takes off a line
+    # Parameters: rule - a compiled rule tuple
+    #             price - the price of one unit
+    #             quantity - how many units
+    # Returns: the discount, never more than the line total
+    ###############################################################
+    kind = rule[0]
+    value = rule[1]
+    if kind == 'percent':
+        discount = price * quantity * value / 100
+    elif kind == 'fixed':
+        discount = value * quantity
+    else:
+        discount = price * (quantity // 2)
+    return min(discount, price * quantity)
+
+
+def best_discount(rules, minute, price, quantity):
+    ################################################################
+    # Function: best_discount
+    # Description: finds the largest discount among the rules that
+    # are active at the given minute
+    # Parameters: rules - a list of compiled rule tuples
+    #             minute - minutes after midnight
+    #             price - the price of one unit
+    #             quantity - how many units
+    # Returns: the discount, 0 if no rule is active
+    ###############################################################
+    best = 0
+    for rule in rules:
+        if is_active(rule, minute):
+            discount = line_discount(rule, price, quantity)
+            if discount > best:
+                best = discount
+    return best
+
+
+def apply_promotions(compiled, items, when=None, currency_code='USD'):
+    ################################################################
+    # Function: apply_promotions
+    # Description: applies the best promotion to each line of a check
+    # and then the best whole-check promotion to what is left
+    # Parameters: compiled - the result of compile_promotions
+    #             items - a list of (item, category, unit price,
+    #             quantity) tuples
+    #             when - a datetime, by default now
+    #             currency_code - the currency used for rounding
+    # Returns: (subtotal, discount, discounted subtotal)
+    ###############################################################
+    if when is None:
+        when = datetime.datetime.now()
+    minute = when.hour * 60 + when.minute
+    hour_rules = compiled[when.hour]
+    no_rules = []
+
+    subtotal = 0
+    discounted = 0
+    for item, category, price, quantity in items:
+        subtotal += price * quantity
+        rules = hour_rules.get(('item', item), no_rules) + \
+            hour_rules.get(('category', category), no_rules)
+        discounted += price * quantity - \
+            best_discount(rules, minute, price, quantity)
+    discounted -= best_discount(hour_rules.get(('check', ''), no_rules),
+                                minute, discounted, 1)
+
+    subtotal = Currency.round_minor(subtotal, currency_code)
+    discounted = Currency.round_minor(discounted, currency_code)
+    return subtotal, Currency.round_minor(subtotal - discounted,
+                                          currency_code), discounted
+
+
+def apply_to_price(compiled, str_price, when=None, currency_code='USD'):
+    ################################################################
+    # Function: apply_to_price
+    # Description: applies the whole-check promotions to a price
+    # typed at the register, ready to be passed to Pricing.calculate
+    # Parameters: compiled - the result of compile_promotions
+    #             str_price - the price as typed
+    #             when - a datetime, by default now
+    #             currency_code - the currency used for rounding
+    # Returns: (price to charge as a string, discount), where the
+    #          price is str_price itself and the discount 0 if it is
+    #          not numeric or no promotion applies
+    ###############################################################
+    if not Util.is_numeric_fast(str_price) or str_price == '.':
+        return str_price, 0
+    if when is None:
+        when = datetime.datetime.now()
+    rules = compiled[when.hour].get(('check', ''))
+    if not rules:
+        return str_price, 0
+    price = float(str_price)
+    discount = best_discount(rules, when.hour * 60 + when.minute, price, 1)
+    if discount <= 0:
+        return str_price, 0
+    charged = Currency.round_minor(price - discount, currency_code)
+    digits = Currency.CURRENCIES[currency_code][1]
+    return (format(charged, '.' + str(digits) + 'f'),
+            Currency.round_minor(price - charged, currency_code))
@@ -0,0 +1,189 @@
+################################################################
+# Project: Total Meal Cost Estimator
+# File: Receipt.py
+# Description: Turns the results of the meal cost calculator into
+# receipts.  A receipt can be rendered as plain text, as bytes for
+# an ESC/POS receipt printer, or as a line of JSON.  Large numbers
+# of receipts can be exported to a file in one call.
+# Author: Gerry
+# Version: 1.0
+###############################################################
+
+import Currency
+import Pricing
+import Settings
+
+# A receipt is a tuple: (price, discount, tax, tip, total)
+PRICE = 0
+DISCOUNT = 1
+TAX = 2
+TIP = 3
+TOTAL = 4
+
+# the labels printed on each line of a receipt, in receipt order
+LINE_LABELS = ('Price:    ', 'Discount: ', 'Tax:      ', 'Tip:      ',
+               'Total:    ')
+# width of the amount column, not counting the currency symbol
+AMOUNT_WIDTH = 9
+
+# currency code: (text template, ESC/POS template, JSON template),
+# each built the first time that currency is used so that a receipt
+# only has to fill in the numbers
+_templates = {}
+
+# how many receipts are rendered before they are written to the file
+EXPORT_BATCH_SIZE = 5000
+# size of the file buffer used when exporting, in bytes
+EXPORT_BUFFER_SIZE = 1024 * 1024
+
+
+def make_receipt(str_price, when=None):
+    ################################################################
+    # Function: make_receipt
+    # Description: runs the calculator on a price, with the active
+    # promotions, and collects the results into a receipt
+    # Parameters: str_price - the price of the meal as typed by the user
+    #             when - a datetime for the promotions, by default now
+    # Returns: a receipt tuple (price, discount, tax, tip, total), or
+    #          None if the price is not numeric
+    ###############################################################
+    result = Pricing.price_meal(str_price, when=when)
+    if result is None:
+        return None
+    return (float(str_price),) + result
+
+
+def make_receipts(prices):
+    ################################################################
+    # Function: make_receipts
+    # Description: builds a receipt for every price in a list,
+    # skipping prices that are not numeric
+    # Parameters: prices - a list of price strings
+    # Returns: a list of receipt tuples
+    ###############################################################
+    receipts = []
+    for str_price in prices:
+        receipt = make_receipt(str_price)
+        if receipt is not None:
+            receipts.append(receipt)
+    return receipts
+
+
+def get_templates(currency_code):
+    ################################################################
+    # Function: get_templates
+    # Description: builds the receipt templates for a currency, using
+    # its symbol and number of digits after the decimal point
+    # Parameters: currency_code - for example 'USD' or 'JPY'
+    # Returns: (text template, ESC/POS template, JSON template)
+    ###############################################################
+    templates = _templates.get(currency_code)
+    if templates is not None:
+        return templates
+    symbol, digits = Currency.CURRENCIES[currency_code]
+    number = str(AMOUNT_WIDTH) + '.' + str(digits) + 'f'
+    last = len(LINE_LABELS) - 1
+
+    text = 'Meal Cost Receipt\n'
+    for label in LINE_LABELS:
+        text += label + symbol + '{:>' + number + '}\n'
+    text += '-' * (len(LINE_LABELS[0]) + len(symbol) + AMOUNT_WIDTH) + '\n'
+
+    # receipt printers only reliably print ASCII, so symbols such as
+    # the euro sign are replaced by the currency code
+    printer_symbol = symbol if symbol.isascii() else currency_code + ' '
+    # ESC @ resets the printer, ESC E turns bold on/off, GS V cuts paper
+    escpos = '\x1b@\x1bE\x01Meal Cost Receipt\x1bE\x00\n'
+    for index in range(len(LINE_LABELS)):
+        line = LINE_LABELS[index] + printer_symbol + '%' + number
+        if index == last:
+            line = '\x1bE\x01' + line + '\x1bE\x00'
+        escpos += line + '\n'
+    escpos += '\n\n\n\x1dV\x00'
+
+    fields = []
+    for label in LINE_LABELS:
+        fields.append('"' + label.strip(' :').lower() + '": {:.' +
+                      str(digits) + 'f}')
+    json_line = ('{{"currency": "' + currency_code + '", ' +
+                 ', '.join(fields) + '}}\n')
+
+    templates = (text.format, escpos.encode('ascii'), json_line.format)
+    _templates[currency_code] = templates
+    return templates
+
+
+def format_text(receipt, currency_code=None):
+    ################################################################
+    # Function: format_text
+    # Description: renders a receipt as plain text
+    # Parameters: receipt - a receipt tuple
+    #             currency_code - by default Settings.CURRENCY_CODE
+    # Returns: string
+    ###############################################################
+    return get_templates(currency_code or Settings.CURRENCY_CODE)[0](*receipt)
+
+
+def format_escpos(receipt, currency_code=None):
+    ################################################################
+    # Function: format_escpos
+    # Description: renders a receipt as ESC/POS printer commands
+    # Parameters: receipt - a receipt tuple
+    #             currency_code - by default Settings.CURRENCY_CODE
+    # Returns: bytes that can be sent straight to the printer
+    ###############################################################
+    return get_templates(currency_code or Settings.CURRENCY_CODE)[1] % \
+        tuple(receipt)
+
+
+def format_json(receipt, currency_code=None):
+    ################################################################
+    # Function: format_json
+    # Description: renders a receipt as one line of JSON
+    # Parameters: receipt - a receipt tuple
+    #             currency_code - by default Settings.CURRENCY_CODE
+    # Returns: string ending in a newline
+    ###############################################################
+    return get_templates(currency_code or Settings.CURRENCY_CODE)[2](*receipt)
+
+
+def export_receipts(receipts, file_name, file_format='text',
+                    currency_code=None):
+    ################################################################
+    # Function: export_receipts
+    # Description: writes a list of receipts to a file.  Receipts
+    # are rendered in batches and each batch is written with a
+    # single call, so the file is not touched once per receipt.
+    # Parameters: receipts - a list of receipt tuples
+    #             file_name - the file to write
+    #             file_format - 'text', 'escpos' or 'json'
+    #             currency_code - by default Settings.CURRENCY_CODE
+    # Returns: the number of receipts written
+    ###############################################################
+    text_template, escpos_template, json_template = \
+        get_templates(currency_code or Settings.CURRENCY_CODE)
+    if file_format == 'text':
+        formatter = lambda receipt: text_template(*receipt)
+        mode = 'w'
+        joiner = ''
+    elif file_format == 'json':
+        formatter = lambda receipt: json_template(*receipt)
+        mode = 'w'
+        joiner = ''
+    elif file_format == 'escpos':
+        formatter = escpos_template.__mod__
+        mode = 'wb'
+        joiner = b''
+    else:
+        raise ValueError('unknown receipt format: ' + str(file_format))
+
+    if mode == 'w':
+        out_file = open(file_name, mode, buffering=EXPORT_BUFFER_SIZE,
+                        encoding='utf-8', newline='\n')
+    else:
+        out_file = open(file_name, mode, buffering=EXPORT_BUFFER_SIZE)
+    with out_file:
+        for start in range(0, len(receipts), EXPORT_BATCH_SIZE):
+            batch = receipts[start:start + EXPORT_BATCH_SIZE]
+            out_file.write(joiner.join(map(formatter, batch)))
+    return len(receipts)
@@ -0,0 +1,257 @@
+################################################################
+# Project: Total Meal Cost Estimator
+# File: Replay.py
+# Description: Offline replay and load generator for the submit
+# button.  It plays back prices recorded by main.py (set RECORD_FILE)
+# or randomly generated ones through main.btn_submit_click, without a
+# window, at a chosen rate or at the pace they were recorded, and
+# reports the throughput and the latency percentiles.
+#
+# When submissions are paced, latency is measured from the time each
+# submission was scheduled, not from when it actually started, so a
+# slow submission that delays the ones behind it shows up in their
+# latency too.  The last part of each wait is spent checking the
+# clock instead of sleeping, so sleep overshoot is not counted.
+#
+# Run it from the command line:
+#     python Replay.py --recording prices.jsonl --rate 200 --duration 30
+#     python Replay.py --recording prices.jsonl --speed 2
+#     python Replay.py --generate 10000 --rate 0
+# Author: Gerry
+# Version: 1.0
+###############################################################
+
+import argparse
+import json
+import random
+import time
+
+import main
+
+# seconds at the end of each wait spent checking the clock, since
+# time.sleep can wake up later than asked
+SPIN_TIME = 0.002
+
+
+class StubEntry:
+    # stands in for an entry box: only get() is used by the submit path
+    def __init__(self):
+        self.text = ''
+
+    def get(self):
+        return self.text
+
+
+class StubLabel:
+    # stands in for a label: accepts the settings ECGUIMeal.change_label makes
+    def __init__(self):
+        self.settings = {}
+
+    def config(self, **settings):
+        self.settings.update(settings)
+
+    def __setitem__(self, key, value):
+        self.settings[key] = value
+
+    def __getitem__(self, key):
+        return self.settings[key]
+
+
+def load_recording(file_name):
+    ################################################################
+    # Function: load_recording
+    # Description: reads prices recorded by main.py
+    # Parameters: file_name - the recording file
+    # Returns: a list of (time submitted, price string)
+    ###############################################################
+    recording = []
+    with open(file_name, encoding='utf-8') as record_file:
+        for line in record_file:
+            if line.strip() != '':
+                submitted, str_price = json.loads(line)
+                recording.append((submitted, str_price))
+    return recording
+
+
+def recorded_offsets(recording, speed=1):
+    ################################################################
+    # Function: recorded_offsets
+    # Description: works out when to submit each recorded price so a
+    # replay keeps the recorded pace
+    # Parameters: recording - the list returned by load_recording
+    #             speed - how much faster than recorded to go, for
+    #             example 2 for twice as fast
+    # Returns: a list of seconds after the start of the replay
+    ###############################################################
+    offsets = []
+    first = recording[0][0] if recording else 0
+    latest = 0
+    for submitted, _ in recording:
+        # never go back in time if the clock was changed while recording
+        latest = max(latest, (submitted - first) / speed)
+        offsets.append(latest)
+    return offsets
+
+
+def wait_until(moment):
+    ################################################################
+    # Function: wait_until
+    # Description: sleeps until shortly before a moment and then
+    # checks the clock until it arrives
+    # Parameters: moment - a time.perf_counter() value
+    # Returns: how many seconds late it woke up, or 0 if the moment
+    #          had already passed when it was called
+    ###############################################################
+    remaining = moment - time.perf_counter()
+    if remaining <= 0:
+        return 0
+    if remaining > SPIN_TIME:
+        time.sleep(remaining - SPIN_TIME)
+    now = time.perf_counter()
+    while now < moment:
+        now = time.perf_counter()
+    return now - moment
+
+
+def generate_prices(count, seed=0):
+    ################################################################
+    # Function: generate_prices
+    # Description: makes prices like the ones typed at a register,
+    # with an occasional mistake
+    # Parameters: count - how many prices to make
+    #             seed - the random seed
+    # Returns: a list of price strings
+    ###############################################################
+    rng = random.Random(seed)
+    prices = []
+    for _ in range(count):
+        if rng.random() < 0.02:
+            prices.append(rng.choice(['ten', 'abc', '12..5', '$20']))
+        else:
+            prices.append('%.2f' % rng.uniform(5, 250))
+    return prices
+
+
+def percentile(sorted_values, fraction):
+    ################################################################
+    # Function: percentile
+    # Description: picks the value below which the given fraction of
+    # the values fall
+    # Parameters: sorted_values - a sorted list of numbers
+    #             fraction - for example 0.99
+    # Returns: number
+    ###############################################################
+    if len(sorted_values) == 0:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+def replay(prices, rate=0, duration=0, offsets=None):
+    ################################################################
+    # Function: replay
+    # Description: submits prices through btn_submit_click at a steady
+    # rate, starting over at the first price when the list runs out,
+    # or at the times given in offsets
+    # Parameters: prices - a list of price strings
+    #             rate - submissions per second, 0 for as fast as
+    #             possible
+    #             duration - seconds to run, 0 to submit each price once
+    #             offsets - seconds after the start to submit each
+    #             price, for example from recorded_offsets; when given,
+    #             rate is ignored and each price is submitted once
+    # Returns: a dictionary with 'count', 'seconds', 'throughput',
+    #          the 'p50', 'p95', 'p99' and 'max' latencies in seconds,
+    #          and 'wake_max', the latest the harness itself woke up
+    #          for a submission, which is included in the latencies
+    ###############################################################
+    entry = StubEntry()
+    lbl_price = StubLabel()
+    lbl_tip = StubLabel()
+    lbl_tax = StubLabel()
+    latencies = []
+    wake_max = 0
+    interval = 1 / rate if rate > 0 else 0
+    start = time.perf_counter()
+    count = 0
+    while True:
+        if duration > 0:
+            if time.perf_counter() - start >= duration:
+                break
+        elif count >= len(prices):
+            break
+        if offsets is not None:
+            if count >= len(offsets):
+                break
+            scheduled = start + offsets[count]
+            wake_max = max(wake_max, wait_until(scheduled))
+        elif interval > 0:
+            scheduled = start + count * interval
+            wake_max = max(wake_max, wait_until(scheduled))
+        else:
+            scheduled = time.perf_counter()
+        entry.text = prices[count % len(prices)]
+        main.btn_submit_click(entry, lbl_price, lbl_tip, lbl_tax)
+        latencies.append(time.perf_counter() - scheduled)
+        count += 1
+    seconds = time.perf_counter() - start
+
+    latencies.sort()
+    return {'count': count,
+            'seconds': seconds,
+            'throughput': count / seconds if seconds > 0 else 0.0,
+            'p50': percentile(latencies, 0.50),
+            'p95': percentile(latencies, 0.95),
+            'p99': percentile(latencies, 0.99),
+            'max': latencies[-1] if latencies else 0.0,
+            'wake_max': wake_max}
+
+
+def print_report(report):
+    ################################################################
+    # Function: print_report
+    # Description: prints the results of a replay
+    # Parameters: report - the dictionary returned by replay
+    # Returns: nothing
+    ###############################################################
+    print(str(report['count']) + ' submissions in %.2f s (%.0f per second)'
+          % (report['seconds'], report['throughput']))
+    for key in ('p50', 'p95', 'p99', 'max'):
+        print('    %-4s %9.1f us' % (key, report[key] * 1000000))
+    if report['wake_max'] > 0:
+        print('    the harness woke up at most %.1f us late' %
+              (report['wake_max'] * 1000000))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Replay prices through the submit button without a '
+                    'window and measure throughput and latency.')
+    parser.add_argument('--recording', default='',
+                        help='a file recorded by main.py (RECORD_FILE)')
+    parser.add_argument('--generate', type=int, default=10000,
+                        help='random prices to use when there is no '
+                             'recording')
+    parser.add_argument('--rate', type=float, default=0,
+                        help='submissions per second, 0 for as fast as '
+                             'possible')
+    parser.add_argument('--speed', type=float, default=0,
+                        help='replay a recording at its recorded pace, '
+                             'sped up by this factor (2 for twice as '
+                             'fast); replaces --rate')
+    parser.add_argument('--duration', type=float, default=0,
+                        help='seconds to run, 0 to submit each price once')
+    args = parser.parse_args()
+    offsets = None
+    if args.recording != '':
+        recording = load_recording(args.recording)
+        prices = [str_price for _, str_price in recording]
+        if args.speed > 0:
+            offsets = recorded_offsets(recording, args.speed)
+    elif args.speed > 0:
+        raise SystemExit('--speed needs a --recording')
+    else:
+        prices = generate_prices(args.generate)
+    if len(prices) == 0:
+        raise SystemExit('no prices to replay')
+    print_report(replay(prices, args.rate, args.duration, offsets))
@@ -0,0 +1,16 @@
+################################################################
+# Project: Total Meal Cost Estimator
+# File: Settings.py
+# Description: The rates and currency used by every part of the
+# calculator.  Kept in a module of their own so that worker
+# processes and tools can read them without importing the GUI.
+# Author: Gerry
+# Version: 1.0
+###############################################################
+
+TIP_FACTOR = 18/100
+TAX_FACTOR = 7/100
+# currency the prices are entered and shown in
+CURRENCY_CODE = 'USD'
+# discounts taken off the price before tax, see Promotions.py
+ACTIVE_PROMOTIONS = []
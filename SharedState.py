@@ -0,0 +1,240 @@
+################################################################
+# Project: Total Meal Cost Estimator
+# File: SharedState.py
+# Description: Puts the tip and tax rates, and a table of
+# precomputed tax, tip and total results, in shared memory so that
+# several calculation worker processes can use one copy instead of
+# each building its own.  A worker attaches by name and can look up
+# results straight away.
+#
+# The shared block holds two copies (slots) of the rates and table.
+# The publisher fills the slot that is not in use and then switches
+# to it, adding one to a sequence number.  A reader notes the
+# sequence number, reads, and reads again if the number changed, so
+# it never uses half of an update.  Only one process should publish.
+#
+# Layout, little-endian:
+#     header: magic 'MEAL', layout version, digits after the decimal
+#             point, sequence number, active slot, table rows
+#     slot 0, slot 1: tip factor, tax factor, then for every price
+#             from 0 up in minor units (cents): tax, tip, total
+# Author: Gerry
+# Version: 1.0
+###############################################################
+
+import array
+import struct
+import sys
+from multiprocessing import shared_memory
+
+import Currency
+import Pricing
+import Settings
+import Util
+
+MAGIC = b'MEAL'
+LAYOUT_VERSION = 1
+# magic, layout version, digits, sequence number, active slot, rows
+HEADER = struct.Struct('<4sHHQII')
+RATES = struct.Struct('<dd')
+ROW = struct.Struct('<ddd')
+
+# the table covers prices up to this many minor units ($1000.00)
+DEFAULT_ROWS = 100001
+
+
+def slot_offset(rows, slot):
+    ################################################################
+    # Function: slot_offset
+    # Description: finds where a slot starts in the shared block
+    # Parameters: rows - the number of rows in each table
+    #             slot - 0 or 1
+    # Returns: byte offset
+    ###############################################################
+    return HEADER.size + slot * (RATES.size + rows * ROW.size)
+
+
+def build_table(rows, digits, tip_factor, tax_factor):
+    ################################################################
+    # Function: build_table
+    # Description: works out tax, tip and total for every price in
+    # the table, rounding the same way as Pricing.CalcTax,
+    # Pricing.CalcTip and Pricing.CalcTotPrice
+    # Parameters: rows - how many prices, starting from 0
+    #             digits - digits after the decimal point
+    #             tip_factor, tax_factor - the rates to use
+    # Returns: the table as bytes
+    ###############################################################
+    scale = 10 ** digits
+    table = array.array('d', bytes(rows * ROW.size))
+    index = 0
+    for minor in range(rows):
+        price = minor / scale
+        tax = round(price * tax_factor, digits)
+        tip = round(price * tip_factor, digits)
+        table[index] = tax
+        table[index + 1] = tip
+        table[index + 2] = round(price + tax + tip, digits)
+        index += 3
+    if sys.byteorder == 'big':
+        table.byteswap()
+    return table.tobytes()
+
+
+def create(name, rows=DEFAULT_ROWS, tip_factor=None, tax_factor=None):
+    ################################################################
+    # Function: create
+    # Description: makes the shared block and publishes the first
+    # rates.  The creating process should call unlink() on the block
+    # when the workers are done with it.
+    # Parameters: name - the name workers attach with
+    #             rows - how many prices the table covers
+    #             tip_factor, tax_factor - the rates, by default the
+    #             ones in Settings.py
+    # Returns: the SharedMemory block
+    ###############################################################
+    if tip_factor is None:
+        tip_factor = Settings.TIP_FACTOR
+    if tax_factor is None:
+        tax_factor = Settings.TAX_FACTOR
+    size = slot_offset(rows, 2)
+    shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+    digits = Currency.CURRENCIES[Settings.CURRENCY_CODE][1]
+    HEADER.pack_into(shm.buf, 0, MAGIC, LAYOUT_VERSION, digits, 0, 1, rows)
+    publish_rates(shm, tip_factor, tax_factor)
+    return shm
+
+
+def attach(name):
+    ################################################################
+    # Function: attach
+    # Description: opens a shared block made by create in another
+    # process.  Workers should be started with the multiprocessing
+    # module from the process that called create, so that they share
+    # its resource tracker and do not remove the block when they exit.
+    # Parameters: name - the name the block was created with
+    # Returns: the SharedMemory block
+    ###############################################################
+    try:
+        shm = shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # track was added in Python 3.13
+        shm = shared_memory.SharedMemory(name=name)
+    magic, layout = HEADER.unpack_from(shm.buf, 0)[:2]
+    if magic != MAGIC or layout != LAYOUT_VERSION:
+        shm.close()
+        raise ValueError('shared block ' + name + ' has an unknown layout')
+    return shm
+
+
+def publish_rates(shm, tip_factor, tax_factor):
+    ################################################################
+    # Function: publish_rates
+    # Description: writes new rates and their table into the unused
+    # slot and then switches every reader over to it at once
+    # Parameters: shm - the shared block
+    #             tip_factor, tax_factor - the new rates
+    # Returns: the new sequence number
+    ###############################################################
+    magic, layout, digits, sequence, active, rows = \
+        HEADER.unpack_from(shm.buf, 0)
+    slot = 1 - active
+    offset = slot_offset(rows, slot)
+    table = build_table(rows, digits, tip_factor, tax_factor)
+    RATES.pack_into(shm.buf, offset, tip_factor, tax_factor)
+    shm.buf[offset + RATES.size:offset + RATES.size + len(table)] = table
+    HEADER.pack_into(shm.buf, 0, magic, layout, digits, sequence + 1, slot,
+                     rows)
+    return sequence + 1
+
+
+def read_rates(shm):
+    ################################################################
+    # Function: read_rates
+    # Description: reads the rates currently published
+    # Parameters: shm - the shared block
+    # Returns: (sequence number, tip factor, tax factor)
+    ###############################################################
+    while True:
+        sequence, active, rows = HEADER.unpack_from(shm.buf, 0)[3:]
+        tip_factor, tax_factor = RATES.unpack_from(
+            shm.buf, slot_offset(rows, active))
+        if HEADER.unpack_from(shm.buf, 0)[3] == sequence:
+            return sequence, tip_factor, tax_factor
+
+
+def price_to_minor(str_price, digits):
+    ################################################################
+    # Function: price_to_minor
+    # Description: turns a price string into a whole number of minor
+    # units (cents)
+    # Parameters: str_price - the price as typed
+    #             digits - digits after the decimal point
+    # Returns: the number of minor units, or -1 if the price is not
+    #          numeric or has too many digits after the decimal point
+    ###############################################################
+    if not Util.is_numeric_fast(str_price):
+        return -1
+    whole, point, fraction = str_price.partition('.')
+    if len(fraction) > digits or (whole == '' and fraction == ''):
+        return -1
+    return int(whole or '0') * 10 ** digits + int(fraction.ljust(digits, '0')
+                                                  or '0')
+
+
+def lookup(shm, str_price):
+    ################################################################
+    # Function: lookup
+    # Description: finds a price's results in the shared table
+    # Parameters: shm - the shared block
+    #             str_price - the price as typed
+    # Returns: (tax, tip, total price), or None if the price is not in
+    #          the table
+    ###############################################################
+    while True:
+        digits, sequence, active, rows = HEADER.unpack_from(shm.buf, 0)[2:]
+        minor = price_to_minor(str_price, digits)
+        if minor < 0 or minor >= rows:
+            return None
+        result = ROW.unpack_from(shm.buf, slot_offset(rows, active) +
+                                 RATES.size + minor * ROW.size)
+        if HEADER.unpack_from(shm.buf, 0)[3] == sequence:
+            return result
+
+
+def calculate(shm, str_price, when=None):
+    ################################################################
+    # Function: calculate
+    # Description: the same as Pricing.price_meal, but works out tax,
+    # tip and total with calculate_price
+    # Parameters: shm - the shared block
+    #             str_price - the price as typed
+    #             when - a datetime for the promotions, by default now
+    # Returns: (discount, tax, tip, total price), or None if the price
+    #          is not numeric
+    ###############################################################
+    return Pricing.price_meal(
+        str_price, lambda charged: calculate_price(shm, charged), when)
+
+
+def calculate_price(shm, str_price):
+    ################################################################
+    # Function: calculate_price
+    # Description: the same as Pricing.calculate, but uses the rates
+    # and table in the shared block.  Prices that are not in the table
+    # are worked out with the shared rates.
+    # Parameters: shm - the shared block
+    #             str_price - the price as typed
+    # Returns: (tax, tip, total price)
+    ###############################################################
+    result = lookup(shm, str_price)
+    if result is not None:
+        return result
+    if not Util.is_numeric_fast(str_price):
+        return (0, 0, 0)
+    digits = HEADER.unpack_from(shm.buf, 0)[2]
+    _, tip_factor, tax_factor = read_rates(shm)
+    price = float(str_price)
+    tax = round(price * tax_factor, digits)
+    tip = round(price * tip_factor, digits)
+    return (tax, tip, round(price + tax + tip, digits))
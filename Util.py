@@ -8,6 +8,9 @@
 # Date: April 2022
 ###############################################################
 
+import re
+
+
 def is_numeric(str_var):
     ################################################################
     # Function: is_numeric
@@ -42,5 +45,18 @@ def is_numeric(str_var):
     return return_val
 
 
+# one optional decimal point anywhere among ASCII digits
+_NUMERIC_PATTERN = re.compile('[0-9]*\\.?[0-9]*')
 
 
+def is_numeric_fast(str_var):
+    ################################################################
+    # Function: is_numeric_fast
+    # Description: gives the same answer as is_numeric, but checks the
+    # whole string with one compiled pattern instead of a loop, and
+    # does not print a message for an empty string
+    # Parameters: str_var
+    # Returns: boolean: True if numeric; False if not numeric
+    # Author: Gerry
+    ###############################################################
+    return len(str_var) > 0 and _NUMERIC_PATTERN.fullmatch(str_var) is not None
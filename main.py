@@ -1,99 +1,171 @@
 # Total Meal Cost Estimator
 # Gerry
 
-import ECGUI
-import Util
-
-TIP_FACTOR = 18/100
-TAX_FACTOR = 7/100
+import bisect
+import collections
+import json
+import time
+
+import ECGUIMeal
+import Currency
+import Metrics
+import Pricing
+import Settings
+
+# where the metrics are written, how often (seconds), and the port they
+# are served on (0 means no HTTP endpoint)
+METRICS_FILE = 'metrics.prom'
+METRICS_INTERVAL = 15
+METRICS_PORT = 0
+
+# how many calculator windows (registers) this program drives
+TERMINAL_COUNT = 1
+# every register appends its results to this one file
+HISTORY_FILE = 'history.csv'
+# every submitted price is also recorded here for Replay.py ('' for off)
+RECORD_FILE = ''
+
+# the controls of one register window
+TERMINAL_LAYOUT = [
+    # entry box for the price of the meal, with its instructions
+    {'type': 'frame', 'bg_color': 'beige', 'fill': 'x', 'children': [
+        {'type': 'label', 'message': "Input Total price of the meal:  ",
+         'bg_color': 'beige', 'side': 'left', 'padding_left': 5},
+        {'type': 'entry_box', 'name': 'txt_price', 'width': 25,
+         'side': 'right', 'padding_right': 5},
+    ]},
+    {'type': 'button', 'name': 'btn_submit', 'message': 'Submit',
+     'padding_top': 6, 'padding_right': 5, 'padding_bottom': 4,
+     'padding_left': 2},
+    # 3 labels for outputs
+    {'type': 'label', 'name': 'lbl_price'},
+    {'type': 'label', 'name': 'lbl_tax'},
+    {'type': 'label', 'name': 'lbl_tip'},
+]
+
+# the open history file, shared by all registers
+history_file = None
+# the open recording file, if prices are being recorded
+record_file = None
+
+# times of the submissions in the last minute, trimmed by the GUI thread
+submit_times = collections.deque()
+
+# gauge: how many prices were submitted in the last minute; only reads
+# submit_times, since it runs on the exporter threads
+def submissions_per_minute():
+    times = tuple(submit_times)
+    return len(times) - bisect.bisect_left(times, time.monotonic() - 60)
+
+# gauge: the share of submitted prices that were not numeric
+def validation_failure_rate():
+    submissions = Metrics.get_counter('meal_submissions_total')
+    if submissions == 0:
+        return 0
+    return Metrics.get_counter('meal_validation_failures_total') / submissions
+
+Metrics.add_counter('meal_submissions_total', 'Prices submitted')
+Metrics.add_counter('meal_validation_failures_total',
+                    'Submitted prices that were not numeric')
+Metrics.add_gauge('meal_submissions_per_minute', submissions_per_minute,
+                  'Prices submitted in the last minute')
+Metrics.add_gauge('meal_validation_failure_ratio', validation_failure_rate,
+                  'Share of submitted prices that were not numeric')
+Metrics.add_histogram('meal_calculation_seconds',
+                      'Time taken to calculate tax, tip and total')
+Metrics.add_histogram('meal_ui_update_seconds',
+                      'Time taken to update the result labels')
 
 def main():
-    my_window = ECGUI.make_window('Meal Cost Estimator', 'white')
+    global history_file, record_file
+    # line buffered, so a crash loses at most the line being written
+    history_file = open(HISTORY_FILE, 'a', buffering=1, encoding='utf-8')
+    if RECORD_FILE != '':
+        record_file = open(RECORD_FILE, 'a', encoding='utf-8')
+
+    my_window = ECGUIMeal.make_window('Meal Cost Estimator', 'white')
+    build_terminal(my_window, 1)
+    # the other registers get their own windows in this same program
+    for register in range(2, TERMINAL_COUNT + 1):
+        window = ECGUIMeal.add_window(my_window, 'Meal Cost Estimator - '
+                                  'Register ' + str(register), 'white')
+        build_terminal(window, register)
+
+    Metrics.start_file_export(METRICS_FILE, METRICS_INTERVAL)
+    if METRICS_PORT != 0:
+        Metrics.start_http_server(METRICS_PORT)
 
-    # create an entry widget for price of meal
-    str_message = "Input Total price of the meal:  "
-    txt_price = build_entry_widget(my_window, str_message)
+    my_window.mainloop()
+    history_file.close()
+    if record_file is not None:
+        record_file.close()
 
-    # create a button
-    btn_submit = ECGUI.add_button(my_window, 'Submit', 6, 5, 4, 2)
-    # create 3 labels for outputs
-    lbl_price = ECGUI.add_label(my_window)
-    lbl_tax = ECGUI.add_label(my_window)
-    lbl_tip = ECGUI.add_label(my_window)
+def build_terminal(window, register):
+    # build the entry box, button and 3 output labels in one pass
+    controls = ECGUIMeal.build_layout(window, TERMINAL_LAYOUT)
 
+    btn_submit = controls['btn_submit']
     btn_submit['command'] = \
-        lambda: btn_submit_click(txt_price, lbl_price, lbl_tip, lbl_tax)
-
-    my_window.mainloop()
-
-def build_entry_widget(window, message):
-    # frame is a container
-    frame = ECGUI.add_frame(window, bg_color='beige', fill='x')
-    # add instructional label: static
-    ECGUI.add_label(frame, message, bg_color='beige', side='left',
-                    padding_left=5)
-    # add textbox: input
-    entry = ECGUI.add_entry_box(frame, width=25, side='right', padding_right=5)
-    # return the textbox
-    return entry
+        lambda: btn_submit_click(controls['txt_price'], controls['lbl_price'],
+                                 controls['lbl_tip'], controls['lbl_tax'],
+                                 register)
 
 # button submit function
-def btn_submit_click(txt_price ,lbl_price, lbl_tip , lbl_tax):
+def btn_submit_click(txt_price ,lbl_price, lbl_tip , lbl_tax, register=1):
     # clear previous results in labels
-    ECGUI.change_label(lbl_price, "")
-    ECGUI.change_label(lbl_tax, "")
-    ECGUI.change_label(lbl_tip, "")
+    ECGUIMeal.change_label(lbl_price, "")
+    ECGUIMeal.change_label(lbl_tax, "")
+    ECGUIMeal.change_label(lbl_tip, "")
 
     # get inputs from textboxes
     str_price = txt_price.get()
-    
-    # call functions to calculate total price, tip and tax
-    tax = CalcTax(str_price)
-    tip = CalcTip(str_price)
-    total_price = CalcTotPrice(str_price, tax, tip)
+    if record_file is not None:
+        record_file.write(json.dumps([time.time(), str_price]) + '\n')
+    Metrics.increment('meal_submissions_total')
+    now = time.monotonic()
+    submit_times.append(now)
+    while submit_times[0] < now - 60:
+        submit_times.popleft()
+
+    # call functions to calculate discount, total price, tip and tax
+    start = time.perf_counter()
+    result = Pricing.price_meal(str_price)
+    calculated = time.perf_counter()
+    Metrics.observe('meal_calculation_seconds', calculated - start)
+    updating = calculated
 
     # analyze the resulting data and put in output label
-    if total_price > 0:
+    if result is not None:
+        discount, tax, tip, total_price = result
+        record_history(register, str_price, discount, tax, tip, total_price)
+        # the history file write is not part of updating the labels
+        updating = time.perf_counter()
         # print the results
-        ECGUI.change_label(lbl_price,"Total Price: $" + str(total_price))
-        ECGUI.change_label(lbl_tax,"Tax: $" + str(tax))
-        ECGUI.change_label(lbl_tip,"Tip: $" + str(tip))
-    else:
-        ECGUI.change_label(lbl_price, "Inputs must be numeric")
-
-# function to calculate total price including tax and tip
-def CalcTotPrice(string_price, st_tax, st_tip):
-
-    # check if input is numeric
-    if Util.is_numeric(string_price):
-        price = float(string_price)
-        tax = float(st_tax)
-        tip = float(st_tip)
-
-        total_p = price + tax + tip
-        total_p = round(total_p, 2)
+        code = Settings.CURRENCY_CODE
+        total_text = "Total Price: " + Currency.format_amount(total_price,
+                                                              code)
+        if discount > 0:
+            total_text += " (saved " + Currency.format_amount(discount,
+                                                              code) + ")"
+        ECGUIMeal.change_label(lbl_price, total_text)
+        ECGUIMeal.change_label(lbl_tax, "Tax: " +
+                               Currency.format_amount(tax, code))
+        ECGUIMeal.change_label(lbl_tip, "Tip: " +
+                               Currency.format_amount(tip, code))
     else:
-        total_p = 0
-    return total_p
-
-def CalcTax(string_price):
-    if Util.is_numeric(string_price):
-        amount = float(string_price)
-        tax = amount * TAX_FACTOR
-        tax = round(tax,2)
-    else:
-        tax = 0
-    return tax
-
-def CalcTip(string_price):
-    if Util.is_numeric(string_price):
-        amount = float(string_price)
-
-        tip = amount * TIP_FACTOR
-        tip = round(tip,2)
-    else:
-        tip = 0
-    return tip
-
-main()
+        Metrics.increment('meal_validation_failures_total')
+        ECGUIMeal.change_label(lbl_price, "Inputs must be numeric")
+    Metrics.observe('meal_ui_update_seconds',
+                    time.perf_counter() - updating)
+
+# write one line per calculation to the shared history file: the
+# register, the price as entered, the discount, tax, tip and total
+def record_history(register, str_price, discount, tax, tip, total_price):
+    if history_file is not None:
+        history_file.write(str(register) + ',' + str_price + ',' +
+                           str(discount) + ',' + str(tax) + ',' + str(tip) +
+                           ',' + str(total_price) + '\n')
+
+if __name__ == '__main__':
+    main()
 